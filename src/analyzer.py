@@ -36,6 +36,25 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
+# Use orjson for JSON columns if available (faster, output is compatible)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    """Encode a JSON column, preferring orjson when it can handle the value."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # orjson rejects values json accepts (numpy floats, non-str
+            # keys, ints wider than 64 bits); encode those with json
+            pass
+    return json.dumps(obj)
+
+
 # Load .env file from project root
 load_dotenv(Path(__file__).parent.parent / ".env")
 
@@ -81,8 +100,15 @@ def get_output_dir() -> Path:
 # =============================================================================
 
 
-def init_db(db_path: Path, verbose: bool = False) -> sqlite3.Connection:
-    """Initialize SQLite database with schema and migrate if needed."""
+def init_db(
+    db_path: Path, verbose: bool = False, create_indexes: bool = True
+) -> sqlite3.Connection:
+    """
+    Initialize SQLite database with schema and migrate if needed.
+
+    Pass create_indexes=False before a bulk load, then call ensure_indexes()
+    afterwards; building indexes once is faster than updating them per insert.
+    """
     conn = sqlite3.connect(db_path)
 
     conn.execute("""
@@ -133,54 +159,98 @@ def init_db(db_path: Path, verbose: bool = False) -> sqlite3.Connection:
     if migrations and verbose:
         print(f"  Migrated database: added columns {migrations}")
 
+    if create_indexes:
+        ensure_indexes(conn)
+    conn.commit()
+    return conn
+
+
+def ensure_indexes(conn: sqlite3.Connection) -> None:
+    """Create the secondary indexes on screenshots and gather planner stats."""
     conn.execute("CREATE INDEX IF NOT EXISTS idx_source_app ON screenshots(source_app)")
     conn.execute(
         "CREATE INDEX IF NOT EXISTS idx_content_type ON screenshots(content_type)"
     )
     conn.execute("CREATE INDEX IF NOT EXISTS idx_topics ON screenshots(topics)")
+
+    # Planner statistics: full ANALYZE until stats exist (an empty table
+    # yields none), then PRAGMA optimize refreshes them when they go stale
+    cursor = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+    if (
+        cursor.fetchone() is None
+        or not conn.execute("SELECT 1 FROM sqlite_stat1 LIMIT 1").fetchone()
+    ):
+        conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize")
     conn.commit()
-    return conn
 
 
-def save_result(conn: sqlite3.Connection, filepath: Path, analysis: dict, backend: str):
-    """Save analysis result to database."""
-    stat = filepath.stat()
+SAVE_RESULT_SQL = """
+    INSERT OR REPLACE INTO screenshots 
+    (filepath, filename, file_size, file_modified, analyzed_at,
+     source_app, content_type, has_text, primary_text, people_mentioned,
+     topics, language, sentiment, description, confidence, 
+     image_width, image_height, backend, raw_response, error, has_people)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
-    conn.execute(
-        """
-        INSERT OR REPLACE INTO screenshots 
-        (filepath, filename, file_size, file_modified, analyzed_at,
-         source_app, content_type, has_text, primary_text, people_mentioned,
-         topics, language, sentiment, description, confidence, 
-         image_width, image_height, backend, raw_response, error, has_people)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """,
-        (
-            str(filepath),
-            filepath.name,
-            stat.st_size,
-            datetime.fromtimestamp(stat.st_mtime).isoformat(),
-            datetime.now().isoformat(),
-            analysis.get("source_app"),
-            analysis.get("content_type"),
-            1 if analysis.get("has_text") else 0,
-            analysis.get("primary_text"),
-            json.dumps(analysis.get("people_mentioned", [])),
-            json.dumps(analysis.get("topics", [])),
-            analysis.get("language"),
-            analysis.get("sentiment"),
-            analysis.get("description"),
-            analysis.get("confidence"),
-            analysis.get("image_width"),
-            analysis.get("image_height"),
-            backend,
-            json.dumps(analysis),
-            analysis.get("error"),
-            1 if analysis.get("has_people") else 0,
-        ),
+
+def _result_row(filepath: Path, analysis: dict, backend: str) -> tuple:
+    """Build the SAVE_RESULT_SQL parameters for one analysis result."""
+    stat = filepath.stat()
+    return (
+        str(filepath),
+        filepath.name,
+        stat.st_size,
+        datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        datetime.now().isoformat(),
+        analysis.get("source_app"),
+        analysis.get("content_type"),
+        1 if analysis.get("has_text") else 0,
+        analysis.get("primary_text"),
+        _dumps(analysis.get("people_mentioned", [])),
+        _dumps(analysis.get("topics", [])),
+        analysis.get("language"),
+        analysis.get("sentiment"),
+        analysis.get("description"),
+        analysis.get("confidence"),
+        analysis.get("image_width"),
+        analysis.get("image_height"),
+        backend,
+        _dumps(analysis),
+        analysis.get("error"),
+        1 if analysis.get("has_people") else 0,
     )
 
 
+def save_result(
+    conn: sqlite3.Connection, filepath: Path, analysis: dict, backend: str
+) -> str:
+    """Save analysis result to database and return the stored filepath."""
+    row = _result_row(filepath, analysis, backend)
+    conn.execute(SAVE_RESULT_SQL, row)
+    return row[0]
+
+
+def save_results(
+    conn: sqlite3.Connection, results: list[tuple[Path, dict, str]]
+) -> list[str]:
+    """
+    Save many analysis results in one transaction.
+
+    Args:
+        conn: Database connection
+        results: (filepath, analysis, backend) tuples
+
+    Returns:
+        Stored filepaths, in input order
+    """
+    rows = [_result_row(path, analysis, backend) for path, analysis, backend in results]
+    with conn:
+        conn.executemany(SAVE_RESULT_SQL, rows)
+    return [row[0] for row in rows]
+
+
 def find_images(
     directories: list[Path],
     skip_analyzed: set[str] | None = None,
@@ -312,7 +382,8 @@ def get_backend(name: str):
 # =============================================================================
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
     parser = argparse.ArgumentParser(
         description="Analyze screenshots with local vision models",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -397,8 +468,11 @@ Examples:
         dest="html",
         help="Skip HTML report generation",
     )
+    return parser
+
 
-    args = parser.parse_args()
+def main(argv: list[str] | None = None):
+    args = build_parser().parse_args(argv)
 
     # Resolve directories to scan
     if args.directory:
@@ -13,11 +13,15 @@ import io
 import re
 import time
 import warnings
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
+from typing import NamedTuple
 
 import cv2
 import numpy as np
-from PIL import Image
+from PIL import Image, ImageOps
 
 from .base import AnalysisBackend, get_device
 
@@ -43,6 +47,12 @@ MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB - skip photos/videos
 
 # Face detection settings
 FACE_DETECT_MAX_DIM = 600  # Downscale for faster face detection
+FACE_SCALE_FACTOR = 1.1  # Pyramid step; larger is faster but can miss faces
+FACE_MIN_NEIGHBORS = 5
+FACE_MIN_SIZE = (30, 30)
+
+# Leading bytes of the image formats detect_faces will try to decode
+IMAGE_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG", b"GIF8", b"RIFF", b"BM")
 
 # Load OpenCV's Haar cascade for face detection (lazy loaded)
 _face_cascade = None
@@ -68,16 +78,19 @@ def detect_faces(image_bytes: bytes) -> bool:
         True if at least one face is detected, False otherwise
     """
     try:
-        # Decode image from bytes
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        if img is None:
+        # Reject empty or non-image input before paying for a decoder
+        if not bytes(image_bytes[:4]).startswith(IMAGE_SIGNATURES):
             return False
 
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            # Let the JPEG decoder downscale in the DCT domain (1/2 to 1/8)
+            # and skip colour conversion, keeping at least the detection size
+            width, height = img.size
+            scale = min(FACE_DETECT_MAX_DIM / max(width, height), 1.0)
+            img.draft("L", (int(width * scale), int(height * scale)))
+            gray = np.asarray(img.convert("L"))
 
-        # Downscale for faster detection
+        # Downscale the rest of the way for faster detection
         height, width = gray.shape
         max_dim = max(height, width)
         if max_dim > FACE_DETECT_MAX_DIM:
@@ -90,9 +103,9 @@ def detect_faces(image_bytes: bytes) -> bool:
         cascade = _get_face_cascade()
         faces = cascade.detectMultiScale(
             gray,
-            scaleFactor=1.1,
-            minNeighbors=5,
-            minSize=(30, 30),
+            scaleFactor=FACE_SCALE_FACTOR,
+            minNeighbors=FACE_MIN_NEIGHBORS,
+            minSize=FACE_MIN_SIZE,
         )
 
         return len(faces) > 0
@@ -116,6 +129,9 @@ def prepare_image_for_ocr(path: Path) -> tuple[bytes, int, int, bool]:
     - Returns JPEG bytes for OCR (faster than PNG for large images)
     """
     with Image.open(path) as img:
+        # Rotate camera photos upright; the re-encoded JPEG drops EXIF, so
+        # OCR and detect_faces would otherwise see them sideways
+        ImageOps.exif_transpose(img, in_place=True)
         orig_width, orig_height = img.size
 
         # Convert to RGB if necessary (for JPEG encoding)
@@ -235,6 +251,46 @@ APP_PATTERNS = {
     ],
 }
 
+# Whole-word patterns (``\bword\b`` or ``\bwords?\b``) are counted from one
+# tokenization pass instead of a regex scan each; \w+ runs are exactly the
+# spans \b...\b can match, so the counts are identical.
+_WORD_RE = re.compile(r"\w+")
+_LITERAL_WORD_RE = re.compile(r"\\b([a-z]+)(s\?)?\\b")
+
+
+class _RuleTable(NamedTuple):
+    """Pattern table flattened into parallel arrays indexed by label."""
+
+    labels: tuple[str, ...]
+    keyword_labels: dict[str, tuple[int, ...]]  # keyword -> label indices
+    regexes: tuple[re.Pattern, ...]
+    regex_labels: tuple[int, ...]  # label index of each regex
+
+
+def _build_rule_table(patterns_by_label: dict[str, list[str]]) -> _RuleTable:
+    """Split patterns into whole-word keywords and compiled regexes."""
+    keyword_labels = {}
+    regexes = []
+    regex_labels = []
+    for index, patterns in enumerate(patterns_by_label.values()):
+        for pattern in patterns:
+            match = _LITERAL_WORD_RE.fullmatch(pattern)
+            if match:
+                words = [match.group(1)]
+                if match.group(2):
+                    words.append(match.group(1) + "s")
+                for word in words:
+                    keyword_labels[word] = keyword_labels.get(word, ()) + (index,)
+            else:
+                regexes.append(re.compile(pattern, re.IGNORECASE))
+                regex_labels.append(index)
+    return _RuleTable(
+        tuple(patterns_by_label), keyword_labels, tuple(regexes), tuple(regex_labels)
+    )
+
+
+_APP_RULES = _build_rule_table(APP_PATTERNS)
+
 # Patterns for content_type detection
 CONTENT_PATTERNS = {
     "code": [
@@ -319,142 +375,253 @@ CONTENT_PATTERNS = {
     ],
 }
 
+_CONTENT_RULES = _build_rule_table(CONTENT_PATTERNS)
+
+# Latin diacritics per language, in both cases to match case-insensitively
+# ("ß".upper() is "SS", so its capital ẞ is listed explicitly).
+_ES_CHARS = frozenset("áéíóúñ¿¡ÁÉÍÓÚÑ")
+_FR_CHARS = frozenset("àâçéèêëïîôùûüÀÂÇÉÈÊËÏÎÔÙÛÜ")
+_DE_CHARS = frozenset("äöüßÄÖÜẞ")
+_NL_CHARS = frozenset("ïëéèüáóÏËÉÈÜÁÓ")
+
+_POSITIVE_WORDS = frozenset(
+    {
+        "great",
+        "awesome",
+        "love",
+        "excellent",
+        "amazing",
+        "good",
+        "happy",
+        "thanks",
+        "beautiful",
+        "perfect",
+    }
+)
+_NEGATIVE_WORDS = frozenset(
+    {
+        "error",
+        "failed",
+        "bad",
+        "terrible",
+        "awful",
+        "hate",
+        "angry",
+        "sad",
+        "broken",
+        "wrong",
+        "issue",
+        "problem",
+    }
+)
+
+# Result limits shared by the standalone extractors and analyze_text
+MAX_MENTIONS = 10  # distinct @mentions kept by extract_people
+MAX_HASHTAGS = 3  # leading #hashtags considered as topics
+MAX_TOPICS = 5  # topics returned by extract_topics
+
+# Substring keywords for extract_topics ("startups" counts as "startup")
+TOPIC_KEYWORDS = (
+    "finance",
+    "tech",
+    "programming",
+    "design",
+    "music",
+    "travel",
+    "food",
+    "sports",
+    "news",
+    "gaming",
+    "ai",
+    "crypto",
+    "startup",
+    "health",
+)
+
+_MENTION_RE = re.compile(r"@(\w+)")
+_HASHTAG_RE = re.compile(r"#(\w+)")
+_ENTITY_RE = re.compile(r"([@#])(\w+)")  # mentions and hashtags in one scan
+_SENTENCE_RE = re.compile(r"[^.!?\n]+")
+
+
+def _count_words(text_lower: str) -> Counter:
+    """Count \\w+ tokens once for all keyword-based classifiers."""
+    return Counter(_WORD_RE.findall(text_lower))
+
+
+def _score_rules(rules: _RuleTable, text_lower: str, words: Counter) -> list[int]:
+    """Score each label by the number of pattern matches in the text."""
+    scores = [0] * len(rules.labels)
+    for word in rules.keyword_labels.keys() & words.keys():
+        count = words[word]
+        for index in rules.keyword_labels[word]:
+            scores[index] += count
+    for pattern, index in zip(rules.regexes, rules.regex_labels):
+        scores[index] += len(pattern.findall(text_lower))
+    return scores
+
+
+def _best_label(rules: _RuleTable, scores: list[int]) -> tuple[str, float] | None:
+    """Pick the highest-scoring label (first on ties), or None if no matches."""
+    best_score = max(scores)
+    if best_score == 0:
+        return None
+    confidence = min(best_score / 5.0, 1.0)
+    return rules.labels[scores.index(best_score)], round(confidence, 2)
+
+
+def _classify_source_app(text_lower: str, words: Counter) -> tuple[str, float]:
+    scores = _score_rules(_APP_RULES, text_lower, words)
+    return _best_label(_APP_RULES, scores) or ("unknown", 0.3)
+
+
+def _classify_content_type(
+    text: str, text_lower: str, words: Counter
+) -> tuple[str, float]:
+    scores = _score_rules(_CONTENT_RULES, text_lower, words)
+    best = _best_label(_CONTENT_RULES, scores)
+    if best is None:
+        if len(text) < 50:
+            return "photo", 0.3
+        elif len(text) > 500:
+            return "article", 0.4
+        return "unknown", 0.3
+    return best
 
-def classify_source_app(text: str) -> tuple[str, float]:
-    """Classify the source app based on extracted text patterns."""
-    text_lower = text.lower()
-    scores = {}
 
-    for app, patterns in APP_PATTERNS.items():
-        score = 0
-        for pattern in patterns:
-            matches = len(re.findall(pattern, text_lower, re.IGNORECASE))
-            score += matches
-        if score > 0:
-            scores[app] = score
+def _detect_sentiment(words: Counter) -> str:
+    positive = sum(words[word] for word in _POSITIVE_WORDS)
+    negative = sum(words[word] for word in _NEGATIVE_WORDS)
+
+    if positive > negative:
+        return "positive"
+    elif negative > positive:
+        return "negative"
+    elif positive > 0 and negative > 0:
+        return "mixed"
+    return "neutral"
 
-    if not scores:
-        return "unknown", 0.3
 
-    best_app = max(scores, key=scores.get)
-    confidence = min(scores[best_app] / 5.0, 1.0)
-    return best_app, round(confidence, 2)
+@lru_cache(maxsize=512)
+def classify_source_app(text: str) -> tuple[str, float]:
+    """Classify the source app based on extracted text patterns."""
+    text_lower = text.lower()
+    return _classify_source_app(text_lower, _count_words(text_lower))
 
 
+@lru_cache(maxsize=512)
 def classify_content_type(text: str) -> tuple[str, float]:
     """Classify the content type based on extracted text patterns."""
     text_lower = text.lower()
-    scores = {}
-
-    for content_type, patterns in CONTENT_PATTERNS.items():
-        score = 0
-        for pattern in patterns:
-            matches = len(re.findall(pattern, text_lower, re.IGNORECASE))
-            score += matches
-        if score > 0:
-            scores[content_type] = score
-
-    if not scores:
-        if len(text) < 50:
-            return "photo", 0.3
-        elif len(text) > 500:
-            return "article", 0.4
-        return "unknown", 0.3
-
-    best_type = max(scores, key=scores.get)
-    confidence = min(scores[best_type] / 5.0, 1.0)
-    return best_type, round(confidence, 2)
+    return _classify_content_type(text, text_lower, _count_words(text_lower))
 
 
-def detect_language(text: str) -> str:
-    """Simple language detection based on character patterns."""
+def _detect_language(text: str) -> str:
     if not text:
         return "unknown"
 
-    if re.search(r"[\u4e00-\u9fff]", text):
-        return "zh"
-    if re.search(r"[\u3040-\u309f\u30a0-\u30ff]", text):
-        return "ja"
-    if re.search(r"[\uac00-\ud7af]", text):
-        return "ko"
-    if re.search(r"[áéíóúñ¿¡]", text, re.IGNORECASE):
+    # Every marker below is non-ASCII; CPython caches this flag on the
+    # string, so plain English text returns without scanning at all.
+    if text.isascii():
+        return "en"
+
+    # One pass to collect distinct characters; the checks below only walk
+    # that (small) set, in the same precedence order as before.
+    chars = set(text)
+    if max(chars) >= "\u3040":
+        if any("\u4e00" <= c <= "\u9fff" for c in chars):
+            return "zh"
+        if any("\u3040" <= c <= "\u30ff" for c in chars):
+            return "ja"
+        if any("\uac00" <= c <= "\ud7af" for c in chars):
+            return "ko"
+    if not chars.isdisjoint(_ES_CHARS):
         return "es"
-    if re.search(r"[àâçéèêëïîôùûü]", text, re.IGNORECASE):
+    if not chars.isdisjoint(_FR_CHARS):
         return "fr"
-    if re.search(r"[äöüß]", text, re.IGNORECASE):
+    if not chars.isdisjoint(_DE_CHARS):
         return "de"
-    if re.search(r"[ïëéèüáó]", text, re.IGNORECASE):
+    if not chars.isdisjoint(_NL_CHARS):
         return "nl"
 
     return "en"
 
 
-def detect_sentiment(text: str) -> str:
-    """Simple sentiment detection based on keywords."""
-    text_lower = text.lower()
+@lru_cache(maxsize=512)
+def detect_language(text: str) -> str:
+    """Simple language detection based on character patterns."""
+    return _detect_language(text)
 
-    positive = len(
-        re.findall(
-            r"\b(great|awesome|love|excellent|amazing|good|happy|thanks|beautiful|perfect)\b",
-            text_lower,
-        )
-    )
-    negative = len(
-        re.findall(
-            r"\b(error|failed|bad|terrible|awful|hate|angry|sad|broken|wrong|issue|problem)\b",
-            text_lower,
-        )
-    )
 
-    if positive > negative:
-        return "positive"
-    elif negative > positive:
-        return "negative"
-    elif positive > 0 and negative > 0:
-        return "mixed"
-    return "neutral"
+def detect_sentiment(text: str) -> str:
+    """Simple sentiment detection based on keywords."""
+    return _detect_sentiment(_count_words(text.lower()))
 
 
 def extract_people(text: str) -> list[str]:
     """Extract @mentions and potential names from text."""
-    mentions = re.findall(r"@(\w+)", text)
-    return list(set(mentions))[:10]
+    # dict keeps first-seen order; stop scanning once the limit is reached
+    mentions = {}
+    for match in _MENTION_RE.finditer(text):
+        mentions[match.group(1)] = None
+        if len(mentions) >= MAX_MENTIONS:
+            break
+    return list(mentions)
+
+
+def _extract_entities(text: str) -> tuple[list[str], list[str]]:
+    """Collect distinct @mentions and leading #hashtags, up to their limits."""
+    mentions = {}
+    hashtags = []
+    for match in _ENTITY_RE.finditer(text):
+        sigil, name = match.groups()
+        if sigil == "@":
+            if len(mentions) < MAX_MENTIONS:
+                mentions[name] = None
+        elif len(hashtags) < MAX_HASHTAGS:
+            hashtags.append(name)
+        if len(mentions) >= MAX_MENTIONS and len(hashtags) >= MAX_HASHTAGS:
+            break
+    return list(mentions), hashtags
 
 
-def extract_topics(text: str, source_app: str, content_type: str) -> list[str]:
-    """Extract topic tags from text and classifications."""
-    topics = []
+def _extract_topics(
+    text: str,
+    text_lower: str | None,
+    hashtags: list[str],
+    source_app: str,
+    content_type: str,
+) -> list[str]:
+    # dict keeps priority order (classifications, hashtags, keywords) and
+    # lets us stop as soon as the topic limit is reached
+    topics = {}
 
     if source_app != "unknown":
-        topics.append(source_app)
+        topics[source_app] = None
     if content_type != "unknown":
-        topics.append(content_type)
+        topics[content_type] = None
 
-    hashtags = re.findall(r"#(\w+)", text)
-    topics.extend(hashtags[:3])
+    for hashtag in hashtags:
+        topics[hashtag] = None
 
-    text_lower = text.lower()
-    topic_keywords = [
-        "finance",
-        "tech",
-        "programming",
-        "design",
-        "music",
-        "travel",
-        "food",
-        "sports",
-        "news",
-        "gaming",
-        "ai",
-        "crypto",
-        "startup",
-        "health",
-    ]
-    for keyword in topic_keywords:
-        if keyword in text_lower:
-            topics.append(keyword)
+    if len(topics) < MAX_TOPICS:
+        if text_lower is None:
+            text_lower = text.lower()
+        for keyword in TOPIC_KEYWORDS:
+            if keyword in text_lower:
+                topics[keyword] = None
+                if len(topics) >= MAX_TOPICS:
+                    break
 
-    return list(set(topics))[:5]
+    return list(topics)[:MAX_TOPICS]
+
+
+def extract_topics(text: str, source_app: str, content_type: str) -> list[str]:
+    """Extract topic tags from text and classifications."""
+    hashtags = [
+        match.group(1) for match in islice(_HASHTAG_RE.finditer(text), MAX_HASHTAGS)
+    ]
+    return _extract_topics(text, None, hashtags, source_app, content_type)
 
 
 def generate_description(
@@ -464,10 +631,10 @@ def generate_description(
     if not has_text:
         return f"Screenshot from {source_app}, appears to be {content_type} content with no readable text."
 
-    sentences = re.split(r"[.!?\n]", text)
+    # Walk sentences lazily; only the first long one is needed
     preview = ""
-    for s in sentences:
-        s = s.strip()
+    for match in _SENTENCE_RE.finditer(text):
+        s = match.group().strip()
         if len(s) > 20:
             preview = s[:100]
             break
@@ -477,6 +644,41 @@ def generate_description(
     return f"Screenshot from {source_app} showing {content_type} content."
 
 
+def analyze_text(text: str) -> dict:
+    """
+    Run all text heuristics over OCR output in one go.
+
+    The text is lowercased and tokenized once and shared by the source-app,
+    content-type, sentiment and topic-keyword checks, and @mentions and
+    #hashtags come from a single scan, instead of each public classifier
+    redoing that work.
+
+    Returns:
+        dict with the text-derived fields of an analysis result (everything
+        except has_people and image dimensions)
+    """
+    text_lower = text.lower()
+    words = _count_words(text_lower)
+    has_text = len(text.strip()) > 0
+
+    source_app, app_confidence = _classify_source_app(text_lower, words)
+    content_type, type_confidence = _classify_content_type(text, text_lower, words)
+    people, hashtags = _extract_entities(text)
+
+    return {
+        "source_app": source_app,
+        "content_type": content_type,
+        "has_text": has_text,
+        "primary_text": text[:500] if text else None,
+        "people_mentioned": people,
+        "topics": _extract_topics(text, text_lower, hashtags, source_app, content_type),
+        "language": _detect_language(text),
+        "sentiment": _detect_sentiment(words),
+        "description": generate_description(text, source_app, content_type, has_text),
+        "confidence": round((app_confidence + type_confidence) / 2, 2),
+    }
+
+
 # =============================================================================
 # OCR BACKEND
 # =============================================================================
@@ -532,39 +734,13 @@ class OCRBackend(AnalysisBackend):
             # Combine all detected text
             text_parts = [result[1] for result in results]
             full_text = " ".join(text_parts)
-            has_text = len(full_text.strip()) > 0
-
-            # Detect faces (people) in the image
-            has_people = detect_faces(image_bytes)
-
-            # Classify
-            source_app, app_confidence = classify_source_app(full_text)
-            content_type, type_confidence = classify_content_type(full_text)
-            language = detect_language(full_text)
-            sentiment = detect_sentiment(full_text)
-            people = extract_people(full_text)
-            topics = extract_topics(full_text, source_app, content_type)
-            description = generate_description(
-                full_text, source_app, content_type, has_text
-            )
 
-            confidence = round((app_confidence + type_confidence) / 2, 2)
-
-            return {
-                "source_app": source_app,
-                "content_type": content_type,
-                "has_text": has_text,
-                "has_people": has_people,
-                "primary_text": full_text[:500] if full_text else None,
-                "people_mentioned": people,
-                "topics": topics,
-                "language": language,
-                "sentiment": sentiment,
-                "description": description,
-                "confidence": confidence,
-                "image_width": orig_width,
-                "image_height": orig_height,
-            }
+            # Classify, then add image-level fields
+            analysis = analyze_text(full_text)
+            analysis["has_people"] = detect_faces(image_bytes)
+            analysis["image_width"] = orig_width
+            analysis["image_height"] = orig_height
+            return analysis
 
         except Exception as e:
             if verbose:
@@ -617,39 +793,13 @@ def analyze_image_standalone(args: tuple) -> tuple[str, dict]:
         # Combine text
         text_parts = [result[1] for result in results]
         full_text = " ".join(text_parts)
-        has_text = len(full_text.strip()) > 0
-
-        # Detect faces (people) in the image
-        has_people = detect_faces(image_bytes)
-
-        # Classify
-        source_app, app_confidence = classify_source_app(full_text)
-        content_type, type_confidence = classify_content_type(full_text)
-        language = detect_language(full_text)
-        sentiment = detect_sentiment(full_text)
-        people = extract_people(full_text)
-        topics = extract_topics(full_text, source_app, content_type)
-        description = generate_description(
-            full_text, source_app, content_type, has_text
-        )
 
-        confidence = round((app_confidence + type_confidence) / 2, 2)
-
-        return path_str, {
-            "source_app": source_app,
-            "content_type": content_type,
-            "has_text": has_text,
-            "has_people": has_people,
-            "primary_text": full_text[:500] if full_text else None,
-            "people_mentioned": people,
-            "topics": topics,
-            "language": language,
-            "sentiment": sentiment,
-            "description": description,
-            "confidence": confidence,
-            "image_width": orig_width,
-            "image_height": orig_height,
-        }
+        # Classify, then add image-level fields
+        analysis = analyze_text(full_text)
+        analysis["has_people"] = detect_faces(image_bytes)
+        analysis["image_width"] = orig_width
+        analysis["image_height"] = orig_height
+        return path_str, analysis
 
     except Exception as e:
         if verbose:
@@ -10,9 +10,14 @@ Usage:
 """
 
 import argparse
+import gzip
 import html
 import json
+import multiprocessing as mp
+import os
 import sqlite3
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from urllib.parse import quote
 
@@ -412,9 +417,6 @@ HTML_TEMPLATE = """<!DOCTYPE html>
     </div>
     
     <script>
-        // Store all card data for modal
-        const cardData = {card_data_json};
-        
         // Filter state
         let activeTab = 'all';
         let activeApp = null;
@@ -512,38 +514,40 @@ HTML_TEMPLATE = """<!DOCTYPE html>
         }});
         
         // Modal
-        function openModal(id) {{
-            const data = cardData[id];
-            if (!data) return;
+        function openModal(card) {{
+            // All modal fields live on the card's data-* attributes
+            const data = card.dataset;
+            const topics = JSON.parse(data.topics || '[]');
+            const people = JSON.parse(data.people || '[]');
             
-            document.getElementById('modal-image').src = data.filepath;
+            document.getElementById('modal-image').src = card.querySelector('.card-image').getAttribute('src');
             document.getElementById('modal-title').textContent = data.filename;
             
             const meta = document.getElementById('modal-meta');
             meta.innerHTML = `
                 <div class="meta-item">
                     <div class="meta-label">Source App</div>
-                    <div class="meta-value">${{data.source_app || 'Unknown'}}</div>
+                    <div class="meta-value">${{data.app || 'Unknown'}}</div>
                 </div>
                 <div class="meta-item">
                     <div class="meta-label">Content Type</div>
-                    <div class="meta-value">${{data.content_type || 'Unknown'}}</div>
+                    <div class="meta-value">${{data.type || 'Unknown'}}</div>
                 </div>
                 <div class="meta-item">
                     <div class="meta-label">Confidence</div>
-                    <div class="meta-value">${{(data.confidence * 100).toFixed(0)}}%</div>
+                    <div class="meta-value">${{(parseFloat(data.confidence) * 100).toFixed(0)}}%</div>
                 </div>
                 <div class="meta-item">
                     <div class="meta-label">Dimensions</div>
-                    <div class="meta-value">${{data.image_width || '?'}} × ${{data.image_height || '?'}}</div>
+                    <div class="meta-value">${{data.width || '?'}} × ${{data.height || '?'}}</div>
                 </div>
                 <div class="meta-item">
                     <div class="meta-label">Has Text</div>
-                    <div class="meta-value">${{data.has_text ? 'Yes' : 'No'}}</div>
+                    <div class="meta-value">${{data.hasText === '1' ? 'Yes' : 'No'}}</div>
                 </div>
                 <div class="meta-item">
                     <div class="meta-label">Has People</div>
-                    <div class="meta-value">${{data.has_people ? 'Yes' : 'No'}}</div>
+                    <div class="meta-value">${{data.hasPeople === '1' ? 'Yes' : 'No'}}</div>
                 </div>
                 <div class="meta-item">
                     <div class="meta-label">Language</div>
@@ -555,21 +559,21 @@ HTML_TEMPLATE = """<!DOCTYPE html>
                 </div>
                 <div class="meta-item">
                     <div class="meta-label">Topics</div>
-                    <div class="meta-value topics">${{(data.topics || []).map(t => `<span class="topic">${{t}}</span>`).join('')}}</div>
+                    <div class="meta-value topics">${{topics.map(t => `<span class="topic">${{t}}</span>`).join('')}}</div>
                 </div>
                 <div class="meta-item">
                     <div class="meta-label">People Mentioned</div>
-                    <div class="meta-value">${{(data.people_mentioned || []).map(p => '@' + p).join(', ') || 'None'}}</div>
+                    <div class="meta-value">${{people.map(p => '@' + p).join(', ') || 'None'}}</div>
                 </div>
                 <div class="meta-item" style="grid-column: 1 / -1;">
                     <div class="meta-label">File Path (click to copy)</div>
                     <div class="meta-value" style="font-family: monospace; cursor: pointer; user-select: all;" 
-                         onclick="navigator.clipboard.writeText(${{JSON.stringify(data.raw_filepath)}}).then(() => this.style.color = '#4da8da'); setTimeout(() => this.style.color = '', 1000);"
-                         title="Click to copy">${{data.raw_filepath || 'Unknown'}}</div>
+                         onclick="navigator.clipboard.writeText(${{JSON.stringify(data.filepath)}}).then(() => this.style.color = '#4da8da'); setTimeout(() => this.style.color = '', 1000);"
+                         title="Click to copy">${{data.filepath || 'Unknown'}}</div>
                 </div>
             `;
             
-            document.getElementById('modal-text').textContent = data.primary_text || '(No text extracted)';
+            document.getElementById('modal-text').textContent = data.text || '(No text extracted)';
             document.getElementById('modal').classList.add('active');
             document.body.style.overflow = 'hidden';
         }}
@@ -593,7 +597,11 @@ CARD_TEMPLATE = """
 <div class="card" data-id="{id}" data-app="{source_app}" data-type="{content_type}" 
      data-description="{description_escaped}" data-text="{text_escaped}"
      data-has-text="{has_text}" data-has-people="{has_people}"
-     onclick="openModal({id})">
+     data-filename="{filename}" data-filepath="{filepath_escaped}"
+     data-confidence="{confidence}" data-language="{language}" data-sentiment="{sentiment}"
+     data-width="{image_width}" data-height="{image_height}"
+     data-topics="{topics_json}" data-people="{people_json}"
+     onclick="openModal(this)">
     <img class="card-image" src="{image_url}" alt="{filename}" loading="lazy"
          onerror="this.style.display='none'">
     <div class="card-body">
@@ -615,19 +623,85 @@ CARD_TEMPLATE = """
 """
 
 
+FILTER_BUTTON_TEMPLATE = (
+    '<button class="filter-btn" data-%s="%s" onclick="%s(\'%s\', this)">'
+    "%s (%d)</button>"
+)
+
+
+def _minify_template(template: str) -> str:
+    """Strip indentation, blank lines, and whole-line CSS/JS comments.
+
+    Line breaks are kept so JavaScript statement boundaries are unaffected.
+    """
+    lines = []
+    for line in template.splitlines():
+        line = line.strip()
+        if not line or line.startswith("//"):
+            continue
+        if line.startswith("/*") and line.endswith("*/"):
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+# Minified once at import; these are what generate_report() renders
+_HTML_TEMPLATE_MIN = _minify_template(HTML_TEMPLATE)
+_CARD_TEMPLATE_MIN = _minify_template(CARD_TEMPLATE)
+
+# Compression level for the pre-compressed report.html.gz
+GZIP_LEVEL = 6
+
+# Parallel card rendering (only worth the process startup for large reports)
+DEFAULT_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_ROWS = 5000
+
+
 # =============================================================================
 # REPORT GENERATOR
 # =============================================================================
 
 
+REPORT_COLUMNS = (
+    "id",
+    "filepath",
+    "filename",
+    "source_app",
+    "content_type",
+    "has_text",
+    "has_people",
+    "primary_text",
+    "description",
+    "confidence",
+    "language",
+    "sentiment",
+    "topics",
+    "people_mentioned",
+    "image_width",
+    "image_height",
+)
+
+
 def load_screenshots(db_path: Path) -> list[dict]:
     """Load all screenshots from database."""
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
 
-    cursor = conn.execute("""
-        SELECT * FROM screenshots 
-        WHERE error IS NULL 
+    # Read-only bulk scan: larger page cache, memory-mapped I/O, no writes
+    conn.executescript("""
+        PRAGMA query_only = 1;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA cache_size = -65536;
+        PRAGMA mmap_size = 268435456;
+    """)
+
+    # Only the columns the report renders (older databases may lack some)
+    existing_cols = {row[1] for row in conn.execute("PRAGMA table_info(screenshots)")}
+    columns = [col for col in REPORT_COLUMNS if col in existing_cols]
+
+    cursor = conn.execute(f"""
+        SELECT {", ".join(columns)} FROM screenshots
+        WHERE error IS NULL
         ORDER BY analyzed_at DESC
     """)
 
@@ -649,63 +723,37 @@ def load_screenshots(db_path: Path) -> list[dict]:
     return rows
 
 
-def get_app_counts(screenshots: list[dict]) -> dict[str, int]:
-    """Count screenshots by source app."""
-    counts = {}
-    for s in screenshots:
-        app = s.get("source_app") or "unknown"
-        counts[app] = counts.get(app, 0) + 1
-    return dict(sorted(counts.items(), key=lambda x: -x[1]))
-
-
-def get_type_counts(screenshots: list[dict]) -> dict[str, int]:
-    """Count screenshots by content type."""
-    counts = {}
-    for s in screenshots:
-        ctype = s.get("content_type") or "unknown"
-        counts[ctype] = counts.get(ctype, 0) + 1
-    return dict(sorted(counts.items(), key=lambda x: -x[1]))
-
-
-def generate_report(db_path: Path, output_path: Path) -> None:
-    """Generate HTML report from database."""
-    screenshots = load_screenshots(db_path)
-
-    if not screenshots:
-        print("No screenshots found in database.")
-        return
-
-    # Generate stats
-    app_counts = get_app_counts(screenshots)
-    type_counts = get_type_counts(screenshots)
-    stats = f"{len(screenshots)} screenshots analyzed"
-    total_count = len(screenshots)
-
-    # Count feature stats
-    has_text_count = sum(1 for s in screenshots if s.get("has_text"))
-    has_people_count = sum(1 for s in screenshots if s.get("has_people"))
-
-    # Generate filter buttons
-    app_filters = " ".join(
-        f'<button class="filter-btn" data-app="{app}" onclick="filterByApp(\'{app}\', this)">'
-        f"{app} ({count})</button>"
-        for app, count in list(app_counts.items())[:8]
-    )
-
-    type_filters = " ".join(
-        f'<button class="filter-btn" data-type="{ctype}" onclick="filterByType(\'{ctype}\', this)">'
-        f"{ctype} ({count})</button>"
-        for ctype, count in list(type_counts.items())[:8]
-    )
-
-    # Generate cards
+def _render_chunk(
+    screenshots: list[dict],
+) -> tuple[list[str], Counter, Counter, int, int]:
+    """
+    Render cards for a slice of screenshots and tally their filter counts.
+
+    Returns:
+        (cards, app_counts, type_counts, has_text_count, has_people_count)
+    """
+    # Single pass: counts, feature stats, and cards together
+    app_counts = Counter()
+    type_counts = Counter()
+    has_text_count = 0
+    has_people_count = 0
     cards = []
-    card_data = {}
+
+    # App/type labels repeat across rows; keep one shared string per label
+    labels = {}
 
     for s in screenshots:
         sid = s.get("id", 0)
         filepath = s.get("filepath", "")
 
+        app = s.get("source_app") or "unknown"
+        app = labels.setdefault(app, app)
+        ctype = s.get("content_type") or "unknown"
+        ctype = labels.setdefault(ctype, ctype)
+
+        app_counts[app] += 1
+        type_counts[ctype] += 1
+
         # Convert to file:// URL for local viewing
         if filepath:
             image_url = "file://" + quote(filepath)
@@ -715,24 +763,34 @@ def generate_report(db_path: Path, output_path: Path) -> None:
         # has_text and has_people as 1/0 for data attributes
         has_text = 1 if s.get("has_text") else 0
         has_people = 1 if s.get("has_people") else 0
+        has_text_count += has_text
+        has_people_count += has_people
 
         # Generate people badge if has_people
         people_badge = (
             '<span class="badge badge-people">👤 people</span>' if has_people else ""
         )
 
-        card = CARD_TEMPLATE.format(
+        card = _CARD_TEMPLATE_MIN.format(
             id=sid,
-            source_app=s.get("source_app") or "unknown",
-            content_type=s.get("content_type") or "unknown",
+            source_app=app,
+            content_type=ctype,
             filename=html.escape(s.get("filename") or ""),
             description=html.escape(s.get("description") or ""),
             description_escaped=html.escape(s.get("description") or "").replace(
                 '"', "&quot;"
             ),
-            text_escaped=html.escape(s.get("primary_text") or "")[:200].replace(
+            text_escaped=html.escape(s.get("primary_text") or "").replace(
                 '"', "&quot;"
             ),
+            filepath_escaped=html.escape(filepath),
+            confidence=s.get("confidence") or 0,
+            language=html.escape(s.get("language") or ""),
+            sentiment=html.escape(s.get("sentiment") or ""),
+            image_width=s.get("image_width") or "",
+            image_height=s.get("image_height") or "",
+            topics_json=html.escape(json.dumps(s.get("topics") or [])),
+            people_json=html.escape(json.dumps(s.get("people_mentioned") or [])),
             image_url=image_url,
             confidence_pct=int((s.get("confidence") or 0) * 100),
             has_text=has_text,
@@ -741,42 +799,80 @@ def generate_report(db_path: Path, output_path: Path) -> None:
         )
         cards.append(card)
 
-        # Store data for modal
-        card_data[sid] = {
-            "id": sid,
-            "filepath": image_url,
-            "raw_filepath": filepath,
-            "filename": s.get("filename"),
-            "source_app": s.get("source_app"),
-            "content_type": s.get("content_type"),
-            "description": s.get("description"),
-            "primary_text": s.get("primary_text"),
-            "confidence": s.get("confidence") or 0,
-            "language": s.get("language"),
-            "sentiment": s.get("sentiment"),
-            "topics": s.get("topics") or [],
-            "people_mentioned": s.get("people_mentioned") or [],
-            "image_width": s.get("image_width"),
-            "image_height": s.get("image_height"),
-            "has_text": bool(has_text),
-            "has_people": bool(has_people),
-        }
+    return cards, app_counts, type_counts, has_text_count, has_people_count
+
+
+def _render_filters(kind: str, counts: Counter, limit: int = 8) -> str:
+    """Render filter buttons for the most common values of one field."""
+    handler = "filterBy" + kind.title()
+    return " ".join(
+        FILTER_BUTTON_TEMPLATE % (kind, value, handler, value, value, count)
+        for value, count in counts.most_common(limit)
+    )
+
+
+def generate_report(
+    db_path: Path, output_path: Path, workers: int = DEFAULT_WORKERS
+) -> None:
+    """Generate HTML report from database."""
+    screenshots = load_screenshots(db_path)
+
+    if not screenshots:
+        print("No screenshots found in database.")
+        return
+
+    # Render cards in worker processes for large databases; spawning
+    # workers costs more than it saves below PARALLEL_MIN_ROWS
+    if workers > 1 and len(screenshots) >= PARALLEL_MIN_ROWS:
+        chunk_size = -(-len(screenshots) // workers)
+        chunks = [
+            screenshots[i : i + chunk_size]
+            for i in range(0, len(screenshots), chunk_size)
+        ]
+        ctx = mp.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as executor:
+            results = list(executor.map(_render_chunk, chunks))
+    else:
+        results = [_render_chunk(screenshots)]
+
+    # Merge chunk results in order
+    cards = []
+    app_counts = Counter()
+    type_counts = Counter()
+    has_text_count = 0
+    has_people_count = 0
+    for chunk_cards, chunk_apps, chunk_types, chunk_text, chunk_people in results:
+        cards.extend(chunk_cards)
+        app_counts.update(chunk_apps)
+        type_counts.update(chunk_types)
+        has_text_count += chunk_text
+        has_people_count += chunk_people
+
+    # Generate stats
+    stats = f"{len(screenshots)} screenshots analyzed"
+    total_count = len(screenshots)
+
+    # Generate filter buttons (most common first)
+    app_filters = _render_filters("app", app_counts)
+    type_filters = _render_filters("type", type_counts)
 
     # Generate final HTML
-    html_content = HTML_TEMPLATE.format(
+    html_content = _HTML_TEMPLATE_MIN.format(
         stats=stats,
         app_filters=app_filters,
         type_filters=type_filters,
         cards="\n".join(cards),
-        card_data_json=json.dumps(card_data),
         has_text_count=has_text_count,
         has_people_count=has_people_count,
         total_count=total_count,
     )
 
-    # Write file
+    # Write file, plus a pre-compressed copy for static servers
+    html_bytes = html_content.encode("utf-8")
+    gz_path = output_path.with_name(output_path.name + ".gz")
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(html_content, encoding="utf-8")
+    output_path.write_bytes(html_bytes)
+    gz_path.write_bytes(gzip.compress(html_bytes, compresslevel=GZIP_LEVEL, mtime=0))
     print(f"Report generated: {output_path}")
 
 
@@ -800,6 +896,13 @@ def main():
         type=Path,
         help="Output HTML file (default: same directory as database)",
     )
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Parallel render workers for large reports (default: {DEFAULT_WORKERS})",
+    )
 
     args = parser.parse_args()
 
@@ -808,7 +911,7 @@ def main():
         return 1
 
     output_path = args.output or args.database.parent / "report.html"
-    generate_report(args.database, output_path)
+    generate_report(args.database, output_path, workers=args.workers)
     return 0
 
 
@@ -1,22 +1,97 @@
 """Pytest fixtures for Screenshot Analyzer tests."""
 
-import tempfile
+import io
+import os
+import sqlite3
 from pathlib import Path
+from types import MappingProxyType
 
 import pytest
 
+from analyzer import init_db
+
+
+@pytest.fixture(scope="session")
+def schema_template():
+    """Build the database schema once per session in memory."""
+    conn = init_db(":memory:")
+    yield conn
+    conn.close()
+
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for test outputs."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+def fresh_db(tmp_path, schema_template):
+    """Copy the schema template into a fresh on-disk database."""
+    conn = sqlite3.connect(tmp_path / "test.db")
+    # Test databases don't need crash durability
+    conn.execute("PRAGMA journal_mode=MEMORY")
+    conn.execute("PRAGMA synchronous=OFF")
+    schema_template.backup(conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="class")
+def class_db(schema_template):
+    """Copy the schema template into an in-memory database shared per class."""
+    # Long-lived connection: keep more compiled statements and pages around
+    conn = sqlite3.connect(":memory:", cached_statements=256)
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.row_factory = None  # plain tuples, no per-row factory call
+    schema_template.backup(conn)
+    yield conn
+    conn.close()
 
 
 @pytest.fixture
+def in_memory_db(class_db):
+    """Give each test the class database, rolled back to a savepoint after.
+
+    Tests using this fixture must not commit, or the savepoint is lost.
+    """
+    class_db.execute("SAVEPOINT test")
+    yield class_db
+    class_db.execute("ROLLBACK TO test")
+    class_db.execute("RELEASE test")
+
+
+@pytest.fixture(scope="session")
+def solid_jpeg_bytes():
+    """Return a helper that JPEG-encodes a solid-colour image."""
+    from PIL import Image
+
+    def encode(size: tuple[int, int], color: str = "white") -> bytes:
+        buffer = io.BytesIO()
+        Image.new("RGB", size, color=color).save(buffer, format="JPEG")
+        return buffer.getvalue()
+
+    return encode
+
+
+@pytest.fixture(scope="session")
+def warm_classifiers(solid_jpeg_bytes):
+    """Run each OCR classifier once so one-time setup stays out of test timings.
+
+    Not autouse: importing backends.ocr pulls in EasyOCR/torch, which
+    database-only runs should not pay for.
+    """
+    from backends import ocr
+
+    ocr.analyze_text("warmup @user #tag")
+    ocr.extract_topics("warmup", "unknown", "unknown")
+
+    # Loads the Haar cascade on the first real decode
+    ocr.detect_faces(solid_jpeg_bytes((8, 8)))
+
+
+@pytest.fixture(scope="session")
 def sample_texts():
-    """Sample text snippets for testing classifiers."""
-    return {
+    """Sample text snippets for testing classifiers.
+
+    Shared by the whole session, so it is returned as a read-only mapping.
+    """
+    texts = {
         "twitter": """
             @elonmusk just posted a new tweet about SpaceX 🚀
             2.5K Retweets  15K Likes  1.2K Replies
@@ -82,10 +157,11 @@ def sample_texts():
         "empty": "",
         "minimal": "Hello",
     }
+    return MappingProxyType(texts)
 
 
 @pytest.fixture
-def sample_image_path(temp_dir):
+def sample_image_path(tmp_path):
     """Create a minimal valid PNG image for testing."""
     # Minimal 1x1 white PNG
     png_data = bytes(
@@ -162,6 +238,23 @@ def sample_image_path(temp_dir):
         ]
     )
 
-    img_path = temp_dir / "test_image.png"
+    img_path = tmp_path / "test_image.png"
     img_path.write_bytes(png_data)
     return img_path
+
+
+@pytest.fixture
+def clone_image(sample_image_path):
+    """Return a helper that creates extra copies of the sample image.
+
+    Hardlinks avoid copying data; falls back to a byte copy across devices.
+    """
+
+    def clone(dst: Path) -> Path:
+        try:
+            os.link(sample_image_path, dst)
+        except OSError:
+            dst.write_bytes(sample_image_path.read_bytes())
+        return dst
+
+    return clone
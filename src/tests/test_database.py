@@ -1,35 +1,37 @@
 """Tests for database operations."""
 
 import json
-import sys
-from pathlib import Path
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import numpy as np
 
-from analyzer import cleanup_deleted_files, init_db, save_result
+import analyzer
+from analyzer import (
+    cleanup_deleted_files,
+    ensure_indexes,
+    init_db,
+    save_result,
+    save_results,
+)
 
 
 class TestDatabase:
     """Tests for SQLite database operations."""
 
-    def test_init_db_creates_table(self, temp_dir):
+    def test_init_db_creates_table(self):
         """Test that init_db creates the screenshots table."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
+        conn = init_db(":memory:")
 
         # Check table exists
-        cursor = conn.execute(
+        row = conn.execute(
             "SELECT name FROM sqlite_master WHERE type='table' AND name='screenshots'"
-        )
-        assert cursor.fetchone() is not None
+        ).fetchone()
+        assert row is not None
 
         conn.close()
 
-    def test_init_db_creates_indexes(self, temp_dir):
+    def test_init_db_creates_indexes(self):
         """Test that init_db creates indexes."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
+        conn = init_db(":memory:")
 
         cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
         indexes = [row[0] for row in cursor.fetchall()]
@@ -40,10 +42,9 @@ class TestDatabase:
 
         conn.close()
 
-    def test_init_db_has_people_column(self, temp_dir):
+    def test_init_db_has_people_column(self):
         """Test that init_db creates has_people column in schema."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
+        conn = init_db(":memory:")
 
         cursor = conn.execute("PRAGMA table_info(screenshots)")
         columns = {row[1] for row in cursor.fetchall()}
@@ -52,9 +53,53 @@ class TestDatabase:
 
         conn.close()
 
-    def test_init_db_idempotent(self, temp_dir):
+    def test_init_db_runs_analyze(self, tmp_path):
+        """Test that init_db gathers planner statistics."""
+        db_path = tmp_path / "test.db"
+        conn = init_db(db_path)
+        with conn:
+            conn.executemany(
+                "INSERT INTO screenshots (filepath, source_app) VALUES (?, ?)",
+                [(f"/tmp/img{i}.png", f"app{i % 5}") for i in range(100)],
+            )
+        conn.close()
+
+        # Reopening runs ANALYZE/optimize over the populated table
+        conn = init_db(db_path)
+        row = conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        assert row is not None
+        cursor = conn.execute("SELECT idx FROM sqlite_stat1 WHERE tbl = 'screenshots'")
+        assert "idx_source_app" in {row[0] for row in cursor.fetchall()}
+
+        conn.close()
+
+    def test_init_db_deferred_indexes(self):
+        """Test that indexes can be built after a bulk load."""
+        conn = init_db(":memory:", create_indexes=False)
+
+        cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        assert not [row[0] for row in cursor if row[0].startswith("idx_")]
+
+        with conn:
+            conn.executemany(
+                "INSERT INTO screenshots (filepath, source_app) VALUES (?, ?)",
+                [(f"/tmp/img{i}.png", "twitter") for i in range(1000)],
+            )
+        ensure_indexes(conn)
+
+        cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        indexes = [row[0] for row in cursor.fetchall()]
+        assert "idx_source_app" in indexes
+        assert "idx_content_type" in indexes
+        assert "idx_topics" in indexes
+
+        conn.close()
+
+    def test_init_db_idempotent(self, tmp_path):
         """Test that init_db can be called multiple times safely."""
-        db_path = temp_dir / "test.db"
+        db_path = tmp_path / "test.db"
 
         conn1 = init_db(db_path)
         conn1.close()
@@ -63,11 +108,11 @@ class TestDatabase:
         conn2 = init_db(db_path)
         conn2.close()
 
-    def test_init_db_migrates_has_people(self, temp_dir):
+    def test_init_db_migrates_has_people(self, tmp_path):
         """Test that init_db migrates has_people column to older databases."""
         import sqlite3
 
-        db_path = temp_dir / "test.db"
+        db_path = tmp_path / "test.db"
 
         # Create an "old" database without has_people column but with the
         # columns that indexes are created on (source_app, content_type, topics)
@@ -98,11 +143,18 @@ class TestDatabase:
 
         conn.close()
 
-    def test_save_result(self, temp_dir, sample_image_path):
-        """Test saving analysis results."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
+    def test_filepath_lookup_uses_index(self, in_memory_db):
+        """Test that filepath lookups search an index instead of scanning."""
+        cursor = in_memory_db.execute(
+            "EXPLAIN QUERY PLAN SELECT error FROM screenshots WHERE filepath = ?",
+            ("x",),
+        )
+        details = [row[-1] for row in cursor.fetchall()]
 
+        assert any("SEARCH" in d and "INDEX" in d for d in details), details
+
+    def test_save_result(self, in_memory_db, sample_image_path):
+        """Test saving analysis results."""
         analysis = {
             "source_app": "twitter",
             "content_type": "social_post",
@@ -119,79 +171,66 @@ class TestDatabase:
             "image_height": 1080,
         }
 
-        save_result(conn, sample_image_path, analysis, "ocr")
+        fp = save_result(in_memory_db, sample_image_path, analysis, "ocr")
 
         # Verify saved
-        cursor = conn.execute(
+        row = in_memory_db.execute(
             "SELECT source_app, content_type, backend FROM screenshots WHERE filepath = ?",
-            (str(sample_image_path),),
-        )
-        row = cursor.fetchone()
+            (fp,),
+        ).fetchone()
 
         assert row is not None
         assert row[0] == "twitter"
         assert row[1] == "social_post"
         assert row[2] == "ocr"
 
-        conn.close()
-
-    def test_save_result_has_people(self, temp_dir, sample_image_path):
+    def test_save_result_has_people(
+        self, in_memory_db, tmp_path, clone_image, subtests
+    ):
         """Test that has_people is persisted correctly."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
-
-        # Test with has_people=True
-        analysis = {
-            "source_app": "instagram",
-            "has_people": True,
-        }
-        save_result(conn, sample_image_path, analysis, "ocr")
-
-        cursor = conn.execute(
-            "SELECT has_people FROM screenshots WHERE filepath = ?",
-            (str(sample_image_path),),
-        )
-        row = cursor.fetchone()
-        assert row is not None
-        assert row[0] == 1  # True stored as 1
-
-        # Test with has_people=False (create a new file path)
-        analysis2 = {
-            "source_app": "twitter",
-            "has_people": False,
-        }
-        fake_path = temp_dir / "no_people.png"
-        fake_path.write_bytes(sample_image_path.read_bytes())
-        save_result(conn, fake_path, analysis2, "ocr")
+        # True stored as 1, False stored as 0
+        for has_people, expected in [(True, 1), (False, 0)]:
+            with subtests.test(has_people=has_people):
+                path = clone_image(tmp_path / f"people_{has_people}.png")
+                analysis = {"source_app": "instagram", "has_people": has_people}
+                fp = save_result(in_memory_db, path, analysis, "ocr")
+
+                row = in_memory_db.execute(
+                    "SELECT has_people FROM screenshots WHERE filepath = ?",
+                    (fp,),
+                ).fetchone()
+                assert row is not None
+                assert row[0] == expected
+
+    def test_save_result_flags_stored_as_integers(
+        self, in_memory_db, sample_image_path
+    ):
+        """Test that boolean flags are stored as INTEGER 0/1."""
+        analysis = {"has_text": True, "has_people": False}
+        fp = save_result(in_memory_db, sample_image_path, analysis, "ocr")
 
-        cursor = conn.execute(
-            "SELECT has_people FROM screenshots WHERE filepath = ?",
-            (str(fake_path),),
-        )
-        row = cursor.fetchone()
-        assert row is not None
-        assert row[0] == 0  # False stored as 0
+        row = in_memory_db.execute(
+            "SELECT typeof(has_text), has_text, typeof(has_people), has_people "
+            "FROM screenshots WHERE filepath = ?",
+            (fp,),
+        ).fetchone()
 
-        conn.close()
+        assert row == ("integer", 1, "integer", 0)
 
-    def test_save_result_json_fields(self, temp_dir, sample_image_path):
+    def test_save_result_json_fields(self, in_memory_db, sample_image_path):
         """Test that JSON fields are properly serialized."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
-
         analysis = {
             "source_app": "slack",
             "people_mentioned": ["alice", "bob"],
             "topics": ["engineering", "slack"],
         }
 
-        save_result(conn, sample_image_path, analysis, "ocr")
+        fp = save_result(in_memory_db, sample_image_path, analysis, "ocr")
 
-        cursor = conn.execute(
+        row = in_memory_db.execute(
             "SELECT people_mentioned, topics FROM screenshots WHERE filepath = ?",
-            (str(sample_image_path),),
-        )
-        row = cursor.fetchone()
+            (fp,),
+        ).fetchone()
 
         people = json.loads(row[0])
         topics = json.loads(row[1])
@@ -199,213 +238,217 @@ class TestDatabase:
         assert people == ["alice", "bob"]
         assert topics == ["engineering", "slack"]
 
-        conn.close()
+    def test_save_result_json_values_orjson_rejects(
+        self, in_memory_db, sample_image_path
+    ):
+        """Test that values only the json module can encode are still stored."""
+        analysis = {
+            "source_app": "slack",
+            "confidence": np.float64(0.75),
+            "counts": {1: "non-str key"},
+            "big": 2**70,
+        }
 
-    def test_save_result_with_error(self, temp_dir, sample_image_path):
-        """Test saving results with errors."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
+        fp = save_result(in_memory_db, sample_image_path, analysis, "ocr")
+
+        row = in_memory_db.execute(
+            "SELECT raw_response FROM screenshots WHERE filepath = ?", (fp,)
+        ).fetchone()
+        raw = json.loads(row[0])
+        assert raw["confidence"] == 0.75
+        assert raw["counts"] == {"1": "non-str key"}
+        assert raw["big"] == 2**70
 
+    def test_save_result_without_orjson(
+        self, in_memory_db, sample_image_path, monkeypatch
+    ):
+        """Test the json fallback used when orjson is not installed."""
+        monkeypatch.setattr(analyzer, "orjson", None)
+        analysis = {"people_mentioned": ["alice"], "topics": ["tech"]}
+
+        fp = save_result(in_memory_db, sample_image_path, analysis, "ocr")
+
+        row = in_memory_db.execute(
+            "SELECT people_mentioned, topics, raw_response FROM screenshots"
+            " WHERE filepath = ?",
+            (fp,),
+        ).fetchone()
+        assert row[0] == json.dumps(["alice"])
+        assert row[1] == json.dumps(["tech"])
+        assert json.loads(row[2]) == analysis
+
+    def test_save_result_with_error(self, in_memory_db, sample_image_path):
+        """Test saving results with errors."""
         analysis = {"error": "Failed to process image"}
 
-        save_result(conn, sample_image_path, analysis, "vlm")
+        fp = save_result(in_memory_db, sample_image_path, analysis, "vlm")
 
-        cursor = conn.execute(
+        row = in_memory_db.execute(
             "SELECT error, backend FROM screenshots WHERE filepath = ?",
-            (str(sample_image_path),),
-        )
-        row = cursor.fetchone()
+            (fp,),
+        ).fetchone()
 
         assert row[0] == "Failed to process image"
         assert row[1] == "vlm"
 
-        conn.close()
-
-    def test_save_result_upsert(self, temp_dir, sample_image_path):
+    def test_save_result_upsert(self, in_memory_db, sample_image_path):
         """Test that saving same filepath updates existing row."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
-
         # First save
-        save_result(conn, sample_image_path, {"source_app": "twitter"}, "ocr")
+        fp = save_result(
+            in_memory_db, sample_image_path, {"source_app": "twitter"}, "ocr"
+        )
 
         # Second save (should update)
-        save_result(conn, sample_image_path, {"source_app": "instagram"}, "vlm")
+        save_result(in_memory_db, sample_image_path, {"source_app": "instagram"}, "vlm")
 
         # Should only have one row
-        cursor = conn.execute("SELECT COUNT(*) FROM screenshots")
-        assert cursor.fetchone()[0] == 1
+        row = in_memory_db.execute("SELECT COUNT(*) FROM screenshots").fetchone()
+        assert row[0] == 1
 
         # Should have updated values
-        cursor = conn.execute(
+        row = in_memory_db.execute(
             "SELECT source_app, backend FROM screenshots WHERE filepath = ?",
-            (str(sample_image_path),),
-        )
-        row = cursor.fetchone()
+            (fp,),
+        ).fetchone()
         assert row[0] == "instagram"
         assert row[1] == "vlm"
 
-        conn.close()
-
 
 class TestDeletionDetection:
     """Tests for deletion detection functionality."""
 
-    def test_cleanup_deleted_files_marks_deleted(self, temp_dir, sample_image_path):
+    def test_cleanup_deleted_files_marks_deleted(
+        self, fresh_db, tmp_path, sample_image_path
+    ):
         """Test that cleanup_deleted_files marks deleted files with error."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
-
         # Save a file
-        save_result(conn, sample_image_path, {"source_app": "twitter"}, "ocr")
+        fp = save_result(fresh_db, sample_image_path, {"source_app": "twitter"}, "ocr")
 
         # Delete the file
         sample_image_path.unlink()
 
         # Run cleanup
-        deleted_count = cleanup_deleted_files(conn, [temp_dir], remove_from_db=False)
+        deleted_count = cleanup_deleted_files(
+            fresh_db, [tmp_path], remove_from_db=False
+        )
 
         assert deleted_count == 1
 
         # Check that file is marked with error
-        cursor = conn.execute(
+        row = fresh_db.execute(
             "SELECT error FROM screenshots WHERE filepath = ?",
-            (str(sample_image_path),),
-        )
-        row = cursor.fetchone()
+            (fp,),
+        ).fetchone()
         assert row is not None
         assert row[0] is not None
         assert "File deleted" in row[0]
 
-        conn.close()
-
     def test_cleanup_deleted_files_removes_when_flag_set(
-        self, temp_dir, sample_image_path
+        self, fresh_db, tmp_path, sample_image_path
     ):
         """Test that cleanup_deleted_files removes records when remove_from_db=True."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
-
         # Save a file
-        save_result(conn, sample_image_path, {"source_app": "twitter"}, "ocr")
+        fp = save_result(fresh_db, sample_image_path, {"source_app": "twitter"}, "ocr")
 
         # Delete the file
         sample_image_path.unlink()
 
         # Run cleanup with remove_from_db=True
-        deleted_count = cleanup_deleted_files(conn, [temp_dir], remove_from_db=True)
+        deleted_count = cleanup_deleted_files(fresh_db, [tmp_path], remove_from_db=True)
 
         assert deleted_count == 1
 
         # Check that record is removed
-        cursor = conn.execute(
+        row = fresh_db.execute(
             "SELECT COUNT(*) FROM screenshots WHERE filepath = ?",
-            (str(sample_image_path),),
-        )
-        assert cursor.fetchone()[0] == 0
-
-        conn.close()
+            (fp,),
+        ).fetchone()
+        assert row[0] == 0
 
     def test_cleanup_deleted_files_ignores_existing_files(
-        self, temp_dir, sample_image_path
+        self, fresh_db, tmp_path, sample_image_path
     ):
         """Test that cleanup_deleted_files doesn't affect existing files."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
-
         # Save a file that exists
-        save_result(conn, sample_image_path, {"source_app": "twitter"}, "ocr")
+        fp = save_result(fresh_db, sample_image_path, {"source_app": "twitter"}, "ocr")
 
         # Run cleanup
-        deleted_count = cleanup_deleted_files(conn, [temp_dir], remove_from_db=False)
+        deleted_count = cleanup_deleted_files(
+            fresh_db, [tmp_path], remove_from_db=False
+        )
 
         assert deleted_count == 0
 
         # Check that file is still there without error
-        cursor = conn.execute(
+        row = fresh_db.execute(
             "SELECT error FROM screenshots WHERE filepath = ?",
-            (str(sample_image_path),),
-        )
-        row = cursor.fetchone()
+            (fp,),
+        ).fetchone()
         assert row is not None
         assert row[0] is None  # No error
 
-        conn.close()
-
     def test_cleanup_deleted_files_handles_multiple_deletions(
-        self, temp_dir, sample_image_path
+        self, fresh_db, tmp_path, clone_image, subtests
     ):
         """Test cleanup with multiple deleted files."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
-
-        # Create and save multiple files
-        file1 = temp_dir / "image1.png"
-        file2 = temp_dir / "image2.png"
-        file3 = temp_dir / "image3.png"
-
-        # Copy sample image to create multiple files
-        file1.write_bytes(sample_image_path.read_bytes())
-        file2.write_bytes(sample_image_path.read_bytes())
-        file3.write_bytes(sample_image_path.read_bytes())
-
-        save_result(conn, file1, {"source_app": "twitter"}, "ocr")
-        save_result(conn, file2, {"source_app": "instagram"}, "ocr")
-        save_result(conn, file3, {"source_app": "slack"}, "ocr")
+        # Create and save multiple files from the sample image
+        file1 = clone_image(tmp_path / "image1.png")
+        file2 = clone_image(tmp_path / "image2.png")
+        file3 = clone_image(tmp_path / "image3.png")
+
+        # One batched insert for all files
+        filepaths = save_results(
+            fresh_db,
+            [
+                (file1, {"source_app": "twitter"}, "ocr"),
+                (file2, {"source_app": "instagram"}, "ocr"),
+                (file3, {"source_app": "slack"}, "ocr"),
+            ],
+        )
 
         # Delete two files
         file1.unlink()
         file3.unlink()
 
         # Run cleanup
-        deleted_count = cleanup_deleted_files(conn, [temp_dir], remove_from_db=False)
-
-        assert deleted_count == 2
-
-        # Check that deleted files are marked
-        cursor = conn.execute(
-            "SELECT COUNT(*) FROM screenshots WHERE error IS NOT NULL"
+        deleted_count = cleanup_deleted_files(
+            fresh_db, [tmp_path], remove_from_db=False
         )
-        assert cursor.fetchone()[0] == 2
 
-        # Check that existing file is untouched
-        cursor = conn.execute(
-            "SELECT error FROM screenshots WHERE filepath = ?",
-            (str(file2),),
-        )
-        row = cursor.fetchone()
-        assert row is not None
-        assert row[0] is None  # No error
+        assert deleted_count == 2
 
-        conn.close()
+        # Deleted files are marked, the existing file is untouched
+        for fp, deleted in zip(filepaths, [True, False, True]):
+            with subtests.test(file=fp, deleted=deleted):
+                row = fresh_db.execute(
+                    "SELECT error FROM screenshots WHERE filepath = ?", (fp,)
+                ).fetchone()
+                assert row is not None
+                assert (row[0] is not None) == deleted
 
     def test_cleanup_deleted_files_ignores_already_marked_errors(
-        self, temp_dir, sample_image_path
+        self, fresh_db, tmp_path, sample_image_path
     ):
         """Test that cleanup doesn't re-process files already marked with errors."""
-        db_path = temp_dir / "test.db"
-        conn = init_db(db_path)
-
         # Save a file with an error
         analysis = {"error": "Processing failed"}
-        save_result(conn, sample_image_path, analysis, "ocr")
+        fp = save_result(fresh_db, sample_image_path, analysis, "ocr")
 
         # Delete the file
         sample_image_path.unlink()
 
         # Run cleanup
-        deleted_count = cleanup_deleted_files(conn, [temp_dir], remove_from_db=False)
+        deleted_count = cleanup_deleted_files(
+            fresh_db, [tmp_path], remove_from_db=False
+        )
 
         # Should return 0 because file already has error (not in WHERE error IS NULL)
         assert deleted_count == 0
 
         # Original error should still be there
-        cursor = conn.execute(
+        row = fresh_db.execute(
             "SELECT error FROM screenshots WHERE filepath = ?",
-            (str(sample_image_path),),
-        )
-        row = cursor.fetchone()
+            (fp,),
+        ).fetchone()
         assert row is not None
         assert row[0] == "Processing failed"  # Original error preserved
-
-        conn.close()
@@ -4,13 +4,15 @@ These tests verify the regex-based heuristic classifiers work correctly.
 They don't require any ML models or external dependencies.
 """
 
-import sys
-from pathlib import Path
+import io
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import numpy as np
+import pytest
+from PIL import Image
 
+from backends import ocr
 from backends.ocr import (
+    analyze_text,
     classify_content_type,
     classify_source_app,
     detect_faces,
@@ -19,8 +21,11 @@ from backends.ocr import (
     extract_people,
     extract_topics,
     generate_description,
+    prepare_image_for_ocr,
 )
 
+pytestmark = pytest.mark.usefixtures("warm_classifiers")
+
 
 class TestClassifySourceApp:
     """Tests for source app classification."""
@@ -169,6 +174,10 @@ class TestExtractPeople:
         people = extract_people(text)
         assert len(people) <= 10
 
+    def test_keeps_first_seen_order(self):
+        text = "@carol replied to @alice, cc @bob and @alice"
+        assert extract_people(text) == ["carol", "alice", "bob"]
+
 
 class TestExtractTopics:
     """Tests for topic extraction."""
@@ -196,6 +205,11 @@ class TestExtractTopics:
         topics = extract_topics(text, "twitter", "code")
         assert len(topics) <= 5
 
+    def test_priority_order(self):
+        text = "#python #coding #ml #extra about finance and tech"
+        topics = extract_topics(text, "twitter", "unknown")
+        assert topics == ["twitter", "python", "coding", "ml", "finance"]
+
     def test_unknown_not_included(self):
         topics = extract_topics("Hello world", "unknown", "unknown")
         assert "unknown" not in topics
@@ -222,38 +236,105 @@ class TestGenerateDescription:
         assert len(desc) < 200
 
 
+class TestAnalyzeText:
+    """Tests for the combined text analysis."""
+
+    def test_matches_individual_classifiers(self, sample_texts):
+        text = sample_texts["twitter"]
+        result = analyze_text(text)
+        source_app, _ = classify_source_app(text)
+        content_type, _ = classify_content_type(text)
+        assert result["source_app"] == source_app
+        assert result["content_type"] == content_type
+        assert result["language"] == detect_language(text)
+        assert result["sentiment"] == detect_sentiment(text)
+        assert result["has_text"] is True
+
+    def test_mentions_and_hashtags(self):
+        text = "@ann shared #python and #rust with @bob and @ann #go #extra"
+        result = analyze_text(text)
+        assert result["people_mentioned"] == extract_people(text)
+        assert result["people_mentioned"] == ["ann", "bob"]
+        assert result["topics"] == extract_topics(
+            text, result["source_app"], result["content_type"]
+        )
+
+    def test_does_not_fill_classifier_caches(self, sample_texts):
+        """One-off OCR text should not be retained by the public caches."""
+        cached = (classify_source_app, classify_content_type, detect_language)
+        for classifier in cached:
+            classifier.cache_clear()
+
+        analyze_text(sample_texts["twitter"] + " unique")
+
+        for classifier in cached:
+            assert classifier.cache_info().currsize == 0
+
+    def test_empty_text(self, sample_texts):
+        result = analyze_text(sample_texts["empty"])
+        assert result["source_app"] == "unknown"
+        assert result["has_text"] is False
+        assert result["primary_text"] is None
+        assert result["confidence"] == 0.3
+
+
 class TestDetectFaces:
     """Tests for face detection helper."""
 
-    def test_detect_faces_returns_bool(self):
+    def test_detect_faces_returns_bool(self, solid_jpeg_bytes):
         """Test that detect_faces returns a boolean."""
-        # Create a simple solid color image (no faces)
-        import io
+        # A simple solid color image (no faces)
+        result = detect_faces(solid_jpeg_bytes((100, 100), "white"))
+        assert isinstance(result, bool)
 
-        from PIL import Image
+    def test_detect_faces_no_face_image(self, solid_jpeg_bytes):
+        """Test that detect_faces returns False for an image without faces."""
+        result = detect_faces(solid_jpeg_bytes((200, 200), "blue"))
+        assert result is False
 
-        img = Image.new("RGB", (100, 100), color="white")
-        buffer = io.BytesIO()
-        img.save(buffer, format="JPEG")
-        image_bytes = buffer.getvalue()
+    @pytest.fixture
+    def cascade(self, monkeypatch):
+        """Replace the Haar cascade with a stub that records its input."""
 
-        result = detect_faces(image_bytes)
-        assert isinstance(result, bool)
+        class RecordingCascade:
+            def __init__(self):
+                self.images = []
+                self.faces = ()
 
-    def test_detect_faces_no_face_image(self):
-        """Test that detect_faces returns False for an image without faces."""
-        import io
+            def detectMultiScale(self, image, **kwargs):
+                self.images.append(image)
+                return self.faces
+
+        stub = RecordingCascade()
+        monkeypatch.setattr(ocr, "_get_face_cascade", lambda: stub)
+        return stub
+
+    def test_detect_faces_large_image(self, cascade, solid_jpeg_bytes):
+        """Test that images above the detection size are downscaled and scanned."""
+        assert detect_faces(solid_jpeg_bytes((1600, 1200), "gray")) is False
 
-        from PIL import Image
+        (gray,) = cascade.images
+        assert gray.dtype == np.uint8
+        assert gray.ndim == 2
+        assert max(gray.shape) <= ocr.FACE_DETECT_MAX_DIM
+        assert gray.shape == (450, 600)
 
-        # Create a simple gradient image (no faces)
-        img = Image.new("RGB", (200, 200), color="blue")
+    @pytest.mark.parametrize("image_format", ["PNG", "WEBP", "GIF", "BMP"])
+    def test_detect_faces_decodes_other_formats(self, cascade, image_format):
+        """Test that non-JPEG images reach the cascade as grayscale arrays."""
         buffer = io.BytesIO()
-        img.save(buffer, format="JPEG")
-        image_bytes = buffer.getvalue()
+        Image.new("RGB", (120, 80), color="green").save(buffer, format=image_format)
 
-        result = detect_faces(image_bytes)
-        assert result is False
+        detect_faces(buffer.getvalue())
+
+        (gray,) = cascade.images
+        assert gray.dtype == np.uint8
+        assert gray.shape == (80, 120)
+
+    def test_detect_faces_true_when_cascade_finds_face(self, cascade, solid_jpeg_bytes):
+        """Test that a cascade hit is reported as True."""
+        cascade.faces = [(10, 10, 40, 40)]
+        assert detect_faces(solid_jpeg_bytes((100, 100))) is True
 
     def test_detect_faces_handles_invalid_bytes(self):
         """Test that detect_faces fails safely on invalid image bytes."""
@@ -264,3 +345,30 @@ class TestDetectFaces:
         """Test that detect_faces fails safely on empty bytes."""
         result = detect_faces(b"")
         assert result is False
+
+    def test_detect_faces_handles_none(self):
+        """Test that detect_faces fails safely when given no image at all."""
+        assert detect_faces(None) is False
+
+    def test_detect_faces_accepts_memoryview(self, cascade, solid_jpeg_bytes):
+        """Test that buffer objects other than bytes are decoded too."""
+        detect_faces(memoryview(solid_jpeg_bytes((100, 100))))
+        assert len(cascade.images) == 1
+
+
+class TestPrepareImageForOcr:
+    """Tests for prepare_image_for_ocr function."""
+
+    def test_applies_exif_orientation(self, tmp_path):
+        """Test that EXIF-rotated photos are re-encoded upright."""
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90° clockwise to view
+        path = tmp_path / "rotated.jpg"
+        Image.new("RGB", (200, 100), color="white").save(path, exif=exif)
+
+        image_bytes, width, height, was_resized = prepare_image_for_ocr(path)
+
+        assert (width, height) == (100, 200)
+        assert was_resized is False
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            assert img.size == (100, 200)
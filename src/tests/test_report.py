@@ -0,0 +1,86 @@
+"""Tests for HTML report generation."""
+
+import gzip
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import report
+from analyzer import save_results
+
+
+@pytest.fixture
+def report_db(fresh_db, tmp_path, clone_image):
+    """Seed an on-disk database with a handful of analyzed screenshots."""
+    results = [
+        (
+            clone_image(tmp_path / f"shot{i}.png"),
+            {
+                "source_app": ["twitter", "slack", "terminal"][i % 3],
+                "content_type": ["social_post", "conversation", "code"][i % 3],
+                "has_text": True,
+                "has_people": i % 2 == 0,
+                "primary_text": f"Sample <text> {i}",
+                "people_mentioned": [f"user{i}"],
+                "topics": ["tech", f"topic{i}"],
+                "language": "en",
+                "sentiment": "neutral",
+                "description": f"Screenshot {i}",
+                "confidence": 0.5,
+                "image_width": 100,
+                "image_height": 50,
+            },
+            "ocr",
+        )
+        for i in range(12)
+    ]
+    save_results(fresh_db, results)
+    return tmp_path / "test.db"
+
+
+class TestGenerateReport:
+    """Tests for generate_report output."""
+
+    def test_parallel_matches_serial(self, report_db, tmp_path, monkeypatch):
+        """Parallel chunked rendering produces the same HTML as one process."""
+        monkeypatch.setattr(report, "PARALLEL_MIN_ROWS", 2)
+        pools = []
+
+        class RecordingExecutor(ProcessPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                pools.append(self)
+
+        monkeypatch.setattr(report, "ProcessPoolExecutor", RecordingExecutor)
+        serial = tmp_path / "serial" / "report.html"
+        parallel = tmp_path / "parallel" / "report.html"
+
+        report.generate_report(report_db, serial, workers=1)
+        report.generate_report(report_db, parallel, workers=2)
+
+        assert len(pools) == 1  # only the workers=2 run went parallel
+        assert parallel.read_bytes() == serial.read_bytes()
+        assert serial.read_text().count('class="card"') == 12
+
+    def test_card_data_in_attributes(self, report_db, tmp_path):
+        """Modal data lives on the cards, not in a separate cardData script."""
+        output = tmp_path / "report.html"
+        report.generate_report(report_db, output, workers=1)
+
+        content = output.read_text()
+        assert "cardData" not in content
+        assert "data-topics=" in content
+        assert "Sample &lt;text&gt; 0" in content
+
+    def test_writes_gzip_copy(self, report_db, tmp_path):
+        """report.html.gz decompresses to exactly report.html."""
+        output = tmp_path / "report.html"
+        report.generate_report(report_db, output, workers=1)
+
+        gz_path = tmp_path / "report.html.gz"
+        assert gzip.decompress(gz_path.read_bytes()) == output.read_bytes()
+
+    def test_empty_database_writes_nothing(self, fresh_db, tmp_path):
+        output = tmp_path / "report.html"
+        report.generate_report(tmp_path / "test.db", output, workers=1)
+        assert not output.exists()